@@ -0,0 +1,229 @@
+import ipaddress
+
+import numpy as np
+
+IPV4_MAX = 0xFFFFFFFF
+
+
+class AddressPoolExhausted(Exception):
+    """
+    Raised when a pool has fewer free prefixes than were requested.
+    """
+
+
+def validate_pools(pools):
+    """
+    Check that every configured address pool is a valid IPv4 network.
+
+    Args:
+        pools (dict): Pool names mapped to networks in CIDR notation.
+
+    Raises:
+        ValueError: If ``pools`` is not a mapping or a pool is not a valid
+            network (for example because it has host bits set).
+    """
+    if not isinstance(pools, dict):
+        raise ValueError("Address pools must be a mapping of names to networks.")
+    for name, pool in pools.items():
+        try:
+            ipaddress.IPv4Network(pool)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Pool {name}: {e}") from e
+
+
+def parse_prefixes(entries):
+    """
+    Convert address/mask pairs into integer arrays.
+
+    Args:
+        entries (list): A list of ``(ip_address, subnet_mask)`` string pairs.
+
+    Returns:
+        tuple: ``(addresses, masks, errors)`` where the arrays hold one uint64
+        per entry (0 for entries that failed to parse) and ``errors`` maps the
+        index of each unparseable entry to its error message.
+    """
+    addresses = np.zeros(len(entries), dtype=np.uint64)
+    masks = np.zeros(len(entries), dtype=np.uint64)
+    errors = {}
+    for index, (ip_address, subnet_mask) in enumerate(entries):
+        try:
+            addresses[index] = int(ipaddress.IPv4Address(ip_address))
+            masks[index] = int(ipaddress.IPv4Address(subnet_mask))
+        except ValueError as e:
+            errors[index] = f"Invalid IPv4 address or subnet mask: {e}"
+    return addresses, masks, errors
+
+
+def prefix_bounds(addresses, masks):
+    """
+    Compute the first and last address covered by each prefix.
+
+    Args:
+        addresses (numpy.ndarray): Addresses as uint64 integers.
+        masks (numpy.ndarray): Subnet masks as uint64 integers.
+
+    Returns:
+        tuple: ``(starts, ends)`` arrays of inclusive interval bounds.
+    """
+    starts = addresses & masks
+    ends = starts | (masks ^ np.uint64(IPV4_MAX))
+    return starts, ends
+
+
+def contiguous_masks(masks):
+    """
+    Check which subnet masks are contiguous runs of leading one bits.
+
+    Args:
+        masks (numpy.ndarray): Subnet masks as uint64 integers.
+
+    Returns:
+        numpy.ndarray: A boolean array, True where the mask is contiguous.
+    """
+    host_bits = masks ^ np.uint64(IPV4_MAX)
+    return (host_bits & (host_bits + np.uint64(1))) == 0
+
+
+def find_overlaps(starts, ends):
+    """
+    Find intervals that overlap an earlier interval, in O(n log n).
+
+    Intervals are sorted by start address; an interval overlaps if it starts
+    at or before the largest end address seen so far.
+
+    Args:
+        starts (numpy.ndarray): Inclusive interval start addresses.
+        ends (numpy.ndarray): Inclusive interval end addresses.
+
+    Returns:
+        tuple: ``(indexes, conflicts)`` arrays pairing each overlapping
+        interval with an earlier interval it overlaps.
+    """
+    if len(starts) < 2:
+        empty = np.array([], dtype=np.intp)
+        return empty, empty
+    order = np.lexsort((ends, starts))
+    sorted_ends = ends[order]
+    running_max = np.maximum.accumulate(sorted_ends)
+    positions = np.arange(len(order))
+    running_max_at = np.maximum.accumulate(
+        np.where(sorted_ends == running_max, positions, 0)
+    )
+    overlapping = np.nonzero(starts[order][1:] <= running_max[:-1])[0]
+    return order[overlapping + 1], order[running_max_at[overlapping]]
+
+
+def validate_prefixes(entries):
+    """
+    Validate an address plan.
+
+    Each entry must have a contiguous subnet mask and, for prefixes shorter
+    than /31, must not be the network or broadcast address. No two prefixes
+    may overlap.
+
+    Args:
+        entries (list): A list of ``(ip_address, subnet_mask)`` string pairs.
+
+    Returns:
+        list: A list of ``{"index", "error"}`` dictionaries, sorted by index.
+    """
+    addresses, masks, errors = parse_prefixes(entries)
+    parsed = np.ones(len(entries), dtype=bool)
+    parsed[list(errors)] = False
+
+    host_bits = masks ^ np.uint64(IPV4_MAX)
+    contiguous = contiguous_masks(masks)
+    for index in np.nonzero(parsed & ~contiguous)[0]:
+        errors[int(index)] = "Subnet mask is not contiguous."
+
+    hosts = addresses & host_bits
+    valid = parsed & contiguous
+    reserved = valid & (host_bits >= 3) & ((hosts == 0) | (hosts == host_bits))
+    for index in np.nonzero(reserved)[0]:
+        errors[
+            int(index)
+        ] = "Address is the network or broadcast address of its subnet."
+
+    valid_indexes = np.nonzero(valid)[0]
+    starts, ends = prefix_bounds(addresses[valid_indexes], masks[valid_indexes])
+    for index, conflict in zip(*find_overlaps(starts, ends)):
+        index = int(valid_indexes[index])
+        errors.setdefault(
+            index,
+            f"Prefix overlaps the prefix at index {int(valid_indexes[conflict])}.",
+        )
+
+    return [{"index": index, "error": errors[index]} for index in sorted(errors)]
+
+
+def allocate_prefixes(pool, count, prefix_length=32, allocated=()):
+    """
+    Allocate the next free prefixes from an address pool.
+
+    Args:
+        pool (str): The pool to allocate from, in CIDR notation.
+        count (int): The number of prefixes to allocate.
+        prefix_length (int): The length of each allocated prefix.
+        allocated (list): ``(ip_address, subnet_mask)`` pairs already in use.
+
+    Returns:
+        list: ``(ip_address, subnet_mask)`` string pairs, lowest address first.
+        For prefixes shorter than /31 the address is the first host address
+        of the allocated prefix.
+
+    Raises:
+        ValueError: If the pool, prefix length or allocated entries are invalid.
+        AddressPoolExhausted: If the pool has fewer than ``count`` free prefixes.
+    """
+    network = ipaddress.IPv4Network(pool)
+    if not network.prefixlen <= prefix_length <= 32:
+        raise ValueError(
+            f"Prefix length must be between {network.prefixlen} and 32 for pool {pool}."
+        )
+    addresses, masks, errors = parse_prefixes(allocated)
+    for index in np.nonzero(~contiguous_masks(masks))[0]:
+        errors.setdefault(int(index), "Subnet mask is not contiguous.")
+    if errors:
+        index = min(errors)
+        raise ValueError(f"Allocated entry {index}: {errors[index]}")
+
+    pool_start = int(network.network_address)
+    pool_end = int(network.broadcast_address)
+    size = 1 << (32 - prefix_length)
+
+    # Free gaps lie between each used interval's start and the largest end
+    # address seen before it, once the used intervals are sorted by start.
+    starts, ends = prefix_bounds(addresses, masks)
+    inside = (ends >= pool_start) & (starts <= pool_end)
+    order = np.argsort(starts[inside])
+    starts = starts[inside][order].astype(np.int64)
+    ends = ends[inside][order].astype(np.int64)
+    if len(ends):
+        ends = np.maximum.accumulate(ends)
+
+    gap_starts = np.concatenate(([pool_start], ends + 1))
+    gap_ends = np.concatenate((starts - 1, [pool_end]))
+    aligned = -(-gap_starts // size) * size
+    blocks = np.maximum((gap_ends + 1 - aligned) // size, 0)
+
+    if blocks.sum() < count:
+        raise AddressPoolExhausted(
+            f"Pool {pool} has {int(blocks.sum())} free /{prefix_length} "
+            f"prefixes, {count} requested."
+        )
+
+    cumulative = np.cumsum(blocks)
+    picks = np.arange(count)
+    gaps = np.searchsorted(cumulative, picks, side="right")
+    offsets = picks - (cumulative[gaps] - blocks[gaps])
+    allocations = aligned[gaps] + offsets * size
+    if prefix_length <= 30:
+        # Use the first host address; the network address is not assignable.
+        allocations += 1
+
+    subnet_mask = str(ipaddress.IPv4Network(f"0.0.0.0/{prefix_length}").netmask)
+    return [
+        (str(ipaddress.IPv4Address(int(address))), subnet_mask)
+        for address in allocations
+    ]
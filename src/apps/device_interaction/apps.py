@@ -1,6 +1,26 @@
+import os
+
 from django.apps import AppConfig
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
 
 
 class DeviceInteractionConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.device_interaction"
+
+    def ready(self):
+        from .address_planning import validate_pools
+        from .circuit_breaker import start_prober
+
+        try:
+            validate_pools(settings.ADDRESS_POOLS)
+        except ValueError as e:
+            raise ImproperlyConfigured(f"Invalid ADDRESS_POOLS setting: {e}") from e
+
+        # Only the process that serves runserver requests (the autoreloader's
+        # child) probes devices; management commands such as migrate or
+        # collectstatic must not. Gunicorn starts the prober from
+        # gunicorn.conf.py instead.
+        if os.environ.get("RUN_MAIN") == "true":
+            start_prober()
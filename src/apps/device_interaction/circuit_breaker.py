@@ -0,0 +1,425 @@
+import fcntl
+import json
+import math
+import os
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from urllib.parse import quote, unquote
+
+from django.conf import settings
+
+
+class CircuitBreaker:
+    """
+    Per-device circuit breaker.
+
+    A breaker starts ``closed`` and lets every request through. After
+    ``failure_threshold`` consecutive failures (or a failed reachability probe)
+    it moves to ``open`` and rejects requests immediately instead of letting
+    each one wait for the full connection timeout. Once ``reset_timeout``
+    seconds have passed, or the prober sees the device answer again, it moves
+    to ``half_open`` and admits a single trial request whose outcome decides
+    whether the breaker closes again or re-opens.
+
+    With a ``state_dir`` the state is kept in a JSON file per device, locked
+    with ``flock()``, so that every worker process of a server shares the same
+    breaker. Without one, the state only lives in this process.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name, failure_threshold, reset_timeout, state_dir=None):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state_path = (
+            Path(state_dir) / f"{quote(name, safe='')}.json" if state_dir else None
+        )
+        self._local_state = self._initial_state()
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._state() as state:
+            return state["state"]
+
+    @property
+    def failure_count(self):
+        with self._state() as state:
+            return state["failure_count"]
+
+    def allow_request(self):
+        """
+        Decide whether a request may be sent to the device.
+
+        Returns:
+            bool: True if the request may proceed, False if it must fail fast.
+        """
+        return self.check() is None
+
+    def check(self):
+        """
+        Admit a request, or describe why it is rejected.
+
+        Returns:
+            dict or None: None if the request may proceed, otherwise a
+            snapshot of the breaker taken when the request was rejected.
+        """
+        now = time.time()
+        with self._state() as state:
+            if (
+                state["state"] == self.OPEN
+                and now - state["opened_at"] >= self.reset_timeout
+            ):
+                state["state"] = self.HALF_OPEN
+                state["trial_started_at"] = None
+            if state["state"] == self.CLOSED:
+                return None
+            # A trial left unfinished for reset_timeout (e.g. by a worker that
+            # was killed) no longer blocks a new one.
+            if state["state"] == self.HALF_OPEN and (
+                state["trial_started_at"] is None
+                or now - state["trial_started_at"] >= self.reset_timeout
+            ):
+                state["trial_started_at"] = now
+                return None
+            state["total_rejections"] += 1
+            return self._snapshot(state, now)
+
+    def record_success(self):
+        """
+        Record a successful device interaction and close the breaker.
+        """
+        with self._state() as state:
+            state["state"] = self.CLOSED
+            state["failure_count"] = 0
+            state["opened_at"] = None
+            state["trial_started_at"] = None
+
+    def record_failure(self, error=None):
+        """
+        Record a failed device interaction.
+
+        Args:
+            error (Exception): The error raised while talking to the device.
+        """
+        with self._state() as state:
+            state["failure_count"] += 1
+            state["total_failures"] += 1
+            state["last_failure"] = str(error) if error is not None else None
+            if (
+                state["state"] == self.HALF_OPEN
+                or state["failure_count"] >= self.failure_threshold
+            ):
+                self._open(state)
+            state["trial_started_at"] = None
+
+    def record_probe(self, reachable):
+        """
+        Update the cached health state from a reachability probe.
+
+        An unreachable device trips the breaker straight away; a reachable
+        device moves an open breaker to half-open so the next request is used
+        as a trial.
+
+        Args:
+            reachable (bool): Whether the device answered the probe.
+        """
+        with self._state() as state:
+            state["reachable"] = reachable
+            state["last_probe_at"] = time.time()
+            if not reachable:
+                if state["state"] != self.OPEN:
+                    state["last_failure"] = "Reachability probe failed"
+                    self._open(state)
+            elif state["state"] == self.OPEN:
+                state["state"] = self.HALF_OPEN
+                state["trial_started_at"] = None
+
+    def retry_after(self):
+        """
+        Number of seconds until the breaker will admit a trial request.
+
+        Returns:
+            int: Seconds to wait, 0 if a request may be attempted now.
+        """
+        return self.snapshot()["retry_after"]
+
+    def snapshot(self):
+        """
+        Return the breaker state as a JSON-serialisable dictionary.
+
+        Returns:
+            dict: The current state, counters and cached health of the device.
+        """
+        with self._state() as state:
+            return self._snapshot(state, time.time())
+
+    def _snapshot(self, state, now):
+        # While open, wait out the reset timeout; while half-open, wait for
+        # the trial request in flight to finish or expire.
+        retry_at = None
+        if state["state"] == self.OPEN and state["opened_at"] is not None:
+            retry_at = state["opened_at"] + self.reset_timeout
+        elif state["state"] == self.HALF_OPEN and state["trial_started_at"]:
+            retry_at = state["trial_started_at"] + self.reset_timeout
+        retry_after = 0
+        if retry_at is not None:
+            retry_after = max(math.ceil(retry_at - now), 0)
+        return {
+            "device": self.name,
+            "state": state["state"],
+            "failure_count": state["failure_count"],
+            "failure_threshold": self.failure_threshold,
+            "total_failures": state["total_failures"],
+            "total_rejections": state["total_rejections"],
+            "last_failure": state["last_failure"],
+            "reachable": state["reachable"],
+            "last_probe_at": state["last_probe_at"],
+            "retry_after": retry_after,
+            "shared": self.state_path is not None,
+        }
+
+    @contextmanager
+    def _state(self):
+        with self._lock:
+            if self.state_path is None:
+                yield self._local_state
+                return
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.state_path, "a+") as state_file:
+                fcntl.flock(state_file, fcntl.LOCK_EX)
+                state_file.seek(0)
+                try:
+                    state = json.loads(state_file.read())
+                except ValueError:
+                    state = self._initial_state()
+                original = dict(state)
+                yield state
+                if state != original:
+                    state_file.seek(0)
+                    state_file.truncate()
+                    json.dump(state, state_file)
+
+    def _initial_state(self):
+        return {
+            "device": self.name,
+            "state": self.CLOSED,
+            "failure_count": 0,
+            "total_failures": 0,
+            "total_rejections": 0,
+            "opened_at": None,
+            "trial_started_at": None,
+            "last_failure": None,
+            "reachable": None,
+            "last_probe_at": None,
+        }
+
+    @staticmethod
+    def _open(state):
+        state["state"] = CircuitBreaker.OPEN
+        state["opened_at"] = time.time()
+
+
+class CircuitBreakerRegistry:
+    """
+    Collection of circuit breakers, one per device.
+
+    When ``CIRCUIT_BREAKER_STATE_DIR`` is set, breakers created by other
+    processes are discovered from their state files.
+    """
+
+    def __init__(self):
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def get(self, device_name):
+        """
+        Get the breaker for a device, creating it on first use.
+
+        Args:
+            device_name (str): The host name or address of the device.
+
+        Returns:
+            CircuitBreaker: The breaker guarding the device.
+        """
+        name = str(device_name)
+        with self._lock:
+            breaker = self._breakers.get(name)
+            if breaker is None:
+                breaker = CircuitBreaker(
+                    name,
+                    failure_threshold=int(settings.CIRCUIT_BREAKER_FAILURE_THRESHOLD),
+                    reset_timeout=float(settings.CIRCUIT_BREAKER_RESET_TIMEOUT),
+                    state_dir=settings.CIRCUIT_BREAKER_STATE_DIR,
+                )
+                self._breakers[name] = breaker
+            return breaker
+
+    def all(self):
+        """
+        Return every known breaker, sorted by device name.
+
+        Returns:
+            list: A list of CircuitBreaker instances.
+        """
+        state_dir = settings.CIRCUIT_BREAKER_STATE_DIR
+        if state_dir and Path(state_dir).is_dir():
+            for path in Path(state_dir).glob("*.json"):
+                self.get(unquote(path.stem))
+        with self._lock:
+            return [self._breakers[name] for name in sorted(self._breakers)]
+
+    def clear(self):
+        """
+        Forget every breaker known to this process.
+        """
+        with self._lock:
+            self._breakers.clear()
+
+
+device_breakers = CircuitBreakerRegistry()
+
+
+class DeviceProber(threading.Thread):
+    """
+    Background thread that periodically checks device reachability.
+
+    Each probe opens a TCP connection to every configured port and expects an
+    SSH identification banner back, which covers both the CLI (SSH) and
+    NETCONF-over-SSH endpoints without authenticating.
+
+    With a ``lock_path``, every worker process runs a prober but only the one
+    holding an exclusive ``flock()`` on the lock file probes; the others retry
+    each interval and take over if that worker exits.
+    """
+
+    def __init__(
+        self, targets, interval, timeout, registry=device_breakers, lock_path=None
+    ):
+        super().__init__(name="device-prober", daemon=True)
+        self.targets = targets
+        self.interval = interval
+        self.timeout = timeout
+        self.registry = registry
+        self.lock_path = lock_path
+        self._lock_file = None
+        self._stop_event = threading.Event()
+
+    def run(self):
+        try:
+            while not self._stop_event.is_set():
+                if self.is_leader():
+                    self.probe_all()
+                self._stop_event.wait(self.interval)
+        finally:
+            if self._lock_file is not None:
+                self._lock_file.close()
+                self._lock_file = None
+
+    def stop(self):
+        self._stop_event.set()
+
+    def is_leader(self):
+        """
+        Check whether this prober is the one that should probe the devices.
+
+        Returns:
+            bool: True if there is no lock file or this prober holds its lock.
+        """
+        if self.lock_path is None or self._lock_file is not None:
+            return True
+        Path(self.lock_path).parent.mkdir(parents=True, exist_ok=True)
+        lock_file = open(self.lock_path, "a")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self._lock_file = lock_file
+        return True
+
+    def probe_all(self):
+        """
+        Probe every target once and update its breaker.
+        """
+        for host, ports in self.targets.items():
+            reachable = all(self.probe(host, port) for port in ports)
+            self.registry.get(host).record_probe(reachable)
+
+    def probe(self, host, port):
+        """
+        Check whether a host answers with an SSH banner on a port.
+
+        Args:
+            host (str): The host name or address to probe.
+            port (int): The TCP port to probe.
+
+        Returns:
+            bool: True if the port accepted the connection and sent a banner.
+        """
+        try:
+            with socket.create_connection((host, port), timeout=self.timeout) as sock:
+                sock.settimeout(self.timeout)
+                return sock.recv(4).startswith(b"SSH-")
+        except OSError:
+            return False
+
+
+_prober = None
+_prober_pid = None
+_prober_lock = threading.Lock()
+
+
+def start_prober():
+    """
+    Start the reachability prober for the configured device, once per process.
+
+    Threads do not survive ``fork()``, so the prober is restarted when called
+    from a process other than the one that started it. When
+    ``CIRCUIT_BREAKER_STATE_DIR`` is set, only one process at a time probes.
+
+    Returns:
+        DeviceProber or None: The running prober, or None if probing is disabled.
+    """
+    global _prober, _prober_pid
+
+    if not settings.DEVICE_PROBE_ENABLED or not settings.NETCONF_HOST:
+        return None
+
+    with _prober_lock:
+        if _prober is not None and _prober_pid == os.getpid() and _prober.is_alive():
+            return _prober
+        ports = [int(settings.NETCONF_SSH_PORT), int(settings.NETCONF_PORT)]
+        state_dir = settings.CIRCUIT_BREAKER_STATE_DIR
+        _prober = DeviceProber(
+            targets={settings.NETCONF_HOST: ports},
+            interval=float(settings.DEVICE_PROBE_INTERVAL),
+            timeout=float(settings.DEVICE_PROBE_TIMEOUT),
+            lock_path=Path(state_dir) / "prober.lock" if state_dir else None,
+        )
+        _prober_pid = os.getpid()
+        _prober.start()
+        return _prober
+
+
+def stop_prober():
+    """
+    Stop this process's reachability prober and wait for it to finish.
+
+    Called when a worker exits so that it releases the prober lock and another
+    worker takes over probing.
+    """
+    global _prober, _prober_pid
+
+    with _prober_lock:
+        if _prober is not None and _prober_pid == os.getpid():
+            _prober.stop()
+            _prober.join(_prober.timeout + 1)
+        _prober = None
+        _prober_pid = None
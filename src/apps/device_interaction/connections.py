@@ -0,0 +1,169 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from ncclient import manager
+from netmiko import ConnectHandler
+
+
+class ConnectionPool:
+    """
+    Per-process pool of idle device sessions, keyed by connection parameters.
+
+    Sessions are checked out for the duration of a single request and returned
+    afterwards, so consecutive requests reuse the same SSH/NETCONF session
+    instead of paying the connect and login cost each time. A session that
+    raises while in use is discarded rather than returned. At most
+    ``DEVICE_POOL_MAX_IDLE`` sessions are kept per device, and a session left
+    idle for ``DEVICE_POOL_IDLE_TIMEOUT`` seconds is closed by a background
+    reaper so that idle workers do not hold sessions on the device.
+
+    The pool is fork-aware: a child process never reuses (or closes) sessions
+    it inherited from its parent, since the underlying sockets are shared.
+    """
+
+    def __init__(self, connect, is_alive, close):
+        self._connect = connect
+        self._is_alive = is_alive
+        self._close = close
+        self._reset()
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._reset)
+
+    @contextmanager
+    def connection(self, params):
+        """
+        Check out a session for the given connection parameters.
+
+        Args:
+            params (dict): The device connection parameters.
+
+        Yields:
+            object: A connected device session.
+        """
+        key = self._key(params)
+        conn = self._checkout(key)
+        if conn is None:
+            conn = self._connect(params)
+        try:
+            yield conn
+        except Exception:
+            self._discard(conn)
+            raise
+        else:
+            self._checkin(key, conn)
+
+    def close_expired(self):
+        """
+        Close the idle sessions that have exceeded the idle timeout.
+        """
+        deadline = time.monotonic() - float(settings.DEVICE_POOL_IDLE_TIMEOUT)
+        expired = []
+        with self._lock:
+            for key, entries in self._idle.items():
+                expired.extend(conn for conn, since in entries if since <= deadline)
+                self._idle[key] = [entry for entry in entries if entry[1] > deadline]
+        for conn in expired:
+            self._discard(conn)
+
+    def close_all(self):
+        """
+        Close every idle session, e.g. when a worker is shutting down.
+        """
+        with self._lock:
+            idle = [conn for entries in self._idle.values() for conn, _ in entries]
+            self._idle = {}
+        for conn in idle:
+            self._discard(conn)
+
+    def _reset(self):
+        # Drop references only: the sockets belong to the parent process.
+        self._idle = {}
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._reaper = None
+
+    def _checkout(self, key):
+        if self._pid != os.getpid():
+            self._reset()
+        deadline = time.monotonic() - float(settings.DEVICE_POOL_IDLE_TIMEOUT)
+        while True:
+            with self._lock:
+                entries = self._idle.get(key)
+                if not entries:
+                    return None
+                conn, since = entries.pop()
+            # Liveness checks and disconnects do network I/O, so they run
+            # without holding the pool lock.
+            if since > deadline and self._safe_is_alive(conn):
+                return conn
+            self._discard(conn)
+
+    def _checkin(self, key, conn):
+        max_idle = int(settings.DEVICE_POOL_MAX_IDLE)
+        if max_idle > 0 and self._safe_is_alive(conn):
+            with self._lock:
+                entries = self._idle.setdefault(key, [])
+                if len(entries) < max_idle:
+                    entries.append((conn, time.monotonic()))
+                    self._start_reaper()
+                    return
+        self._discard(conn)
+
+    def _start_reaper(self):
+        # Called with the pool lock held.
+        if self._reaper is not None and self._reaper.is_alive():
+            return
+        self._reaper = threading.Thread(
+            target=self._reap, name="device-pool-reaper", daemon=True
+        )
+        self._reaper.start()
+
+    def _reap(self):
+        interval = max(float(settings.DEVICE_POOL_IDLE_TIMEOUT) / 2, 1)
+        while True:
+            time.sleep(interval)
+            self.close_expired()
+            with self._lock:
+                if not any(self._idle.values()):
+                    self._reaper = None
+                    return
+
+    def _discard(self, conn):
+        try:
+            self._close(conn)
+        except Exception:
+            pass
+
+    def _safe_is_alive(self, conn):
+        try:
+            return bool(self._is_alive(conn))
+        except Exception:
+            return False
+
+    @staticmethod
+    def _key(params):
+        return tuple(sorted((name, repr(value)) for name, value in params.items()))
+
+
+netmiko_pool = ConnectionPool(
+    connect=lambda params: ConnectHandler(**params),
+    is_alive=lambda conn: conn.is_alive(),
+    close=lambda conn: conn.disconnect(),
+)
+
+ncclient_pool = ConnectionPool(
+    connect=lambda params: manager.connect(**params),
+    is_alive=lambda conn: conn.connected,
+    close=lambda conn: conn.close_session(),
+)
+
+
+def close_all_pools():
+    """
+    Close the idle sessions of every device connection pool.
+    """
+    netmiko_pool.close_all()
+    ncclient_pool.close_all()
@@ -1,11 +1,22 @@
+from django.conf import settings
 from rest_framework import serializers
 
+from . import address_planning
+
 
 class LoopbackConfigSerializer(serializers.Serializer):
     loopback_number = serializers.IntegerField()
     ip_address = serializers.IPAddressField()
     subnet_mask = serializers.IPAddressField()
 
+    def validate(self, attrs):
+        errors = address_planning.validate_prefixes(
+            [(attrs["ip_address"], attrs["subnet_mask"])]
+        )
+        if errors:
+            raise serializers.ValidationError(errors[0]["error"])
+        return attrs
+
 
 class LoopbackDeleteSerializer(serializers.Serializer):
     device_name = serializers.CharField(max_length=100)
@@ -14,3 +25,48 @@ class LoopbackDeleteSerializer(serializers.Serializer):
 
 class DryRunConfigSerializer(serializers.Serializer):
     dry_run_mode = serializers.BooleanField()
+
+
+class AddressPlanValidateSerializer(serializers.Serializer):
+    prefixes = serializers.ListField(
+        child=serializers.DictField(),
+        allow_empty=False,
+        max_length=settings.ADDRESS_PLAN_MAX_PREFIXES,
+    )
+
+    def validate_prefixes(self, value):
+        return [
+            (str(prefix.get("ip_address", "")), str(prefix.get("subnet_mask", "")))
+            for prefix in value
+        ]
+
+
+class AddressAllocationSerializer(serializers.Serializer):
+    pool = serializers.CharField(max_length=100)
+    count = serializers.IntegerField(min_value=1)
+    prefix_length = serializers.IntegerField(min_value=0, max_value=32, default=32)
+    allocated = serializers.ListField(
+        child=serializers.DictField(),
+        required=False,
+        default=list,
+        max_length=settings.ADDRESS_PLAN_MAX_PREFIXES,
+    )
+
+    def validate_pool(self, value):
+        if value not in settings.ADDRESS_POOLS:
+            raise serializers.ValidationError(f"Unknown address pool: {value}.")
+        return value
+
+    def validate_count(self, value):
+        if value > settings.ADDRESS_ALLOCATION_MAX:
+            raise serializers.ValidationError(
+                f"At most {settings.ADDRESS_ALLOCATION_MAX} addresses can be "
+                "allocated in one request."
+            )
+        return value
+
+    def validate_allocated(self, value):
+        return [
+            (str(prefix.get("ip_address", "")), str(prefix.get("subnet_mask", "")))
+            for prefix in value
+        ]
@@ -1,15 +1,37 @@
+import os
+import shutil
+import tempfile
 from unittest.mock import patch, MagicMock
 
-from django.test import TestCase
+from django.conf import settings
+from django.test import TestCase, override_settings
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.test import APIRequestFactory
 
+from .address_planning import (
+    AddressPoolExhausted,
+    allocate_prefixes,
+    validate_pools,
+    validate_prefixes,
+)
+from .circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakerRegistry,
+    DeviceProber,
+    device_breakers,
+)
+from .connections import ConnectionPool, ncclient_pool
+from .utils import CommonUtils
+from .serializers import AddressAllocationSerializer, AddressPlanValidateSerializer
 from .views import (
     ListInterfaceView,
     ConfigureLoopbackView,
     DryRunConfigView,
     DeleteLoopbackView,
+    DeviceHealthView,
+    AddressPlanValidateView,
+    AddressAllocationView,
 )
 
 
@@ -53,6 +75,15 @@ class ConfigureLoopbackTestCase(TestCase):
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertEqual(response.data, {"error": "Invalid data"})
 
+    def test_configure_loopback_network_address(self):
+        payload = dict(self.valid_payload, ip_address="192.168.1.0")
+
+        request = self.factory.post("/configure-loopback/", payload)
+        response = ConfigureLoopbackView.as_view()(request)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("non_field_errors", response.data)
+
 
 class DeleteLoopbackTestCase(TestCase):
     def setUp(self):
@@ -86,9 +117,15 @@ class DeleteLoopbackTestCase(TestCase):
         self.assertEqual(response.data, {"error": "loopback_number is required."})
 
 
+@override_settings(CIRCUIT_BREAKER_STATE_DIR=None)
 class ListInterfaceTestCase(TestCase):
     def setUp(self):
         self.factory = APIRequestFactory()
+        device_breakers.clear()
+
+    def tearDown(self):
+        ncclient_pool.close_all()
+        device_breakers.clear()
 
     @patch(
         "apps.device_interaction.views.ConnectionUtils.get_ncclient_connection_params"
@@ -107,6 +144,25 @@ class ListInterfaceTestCase(TestCase):
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+    @override_settings(DRY_RUN=False)
+    @patch(
+        "apps.device_interaction.views.ConnectionUtils.get_ncclient_connection_params"
+    )
+    @patch("ncclient.manager.connect")
+    def test_list_interface_parse_error_is_not_device_failure(
+        self, mock_ncclient_connect, mock_connection_params
+    ):
+        mock_connection_params.return_value = {"host": "router"}
+        mock_manager = MagicMock()
+        mock_manager.get.return_value.data_xml = "<data><unclosed>"
+        mock_ncclient_connect.return_value = mock_manager
+
+        request = self.factory.get("/interfaces/")
+        response = ListInterfaceView.as_view()(request)
+
+        self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
+        self.assertEqual(device_breakers.get("router").failure_count, 0)
+
     @patch("apps.device_interaction.views.settings")
     def test_list_interface_dry_run(self, mock_settings):
         mock_settings.DRY_RUN = True
@@ -149,3 +205,340 @@ class DryRunConfigTestCase(TestCase):
 
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertEqual(response.data, {"error": "Invalid data"})
+
+
+class CircuitBreakerTestCase(TestCase):
+    def setUp(self):
+        self.breaker = CircuitBreaker("router", failure_threshold=2, reset_timeout=30)
+
+    def test_opens_after_threshold_failures(self):
+        self.breaker.record_failure(Exception("timeout"))
+        self.assertTrue(self.breaker.allow_request())
+
+        self.breaker.record_failure(Exception("timeout"))
+
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(self.breaker.allow_request())
+        self.assertEqual(self.breaker.snapshot()["total_rejections"], 1)
+
+    @patch("apps.device_interaction.circuit_breaker.time.time")
+    def test_half_open_allows_single_trial(self, mock_time):
+        mock_time.return_value = 100
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+
+        mock_time.return_value = 131
+        self.assertTrue(self.breaker.allow_request())
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+        self.assertFalse(self.breaker.allow_request())
+
+        mock_time.return_value = 140
+        self.assertEqual(self.breaker.check()["retry_after"], 21)
+
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        self.assertEqual(self.breaker.failure_count, 0)
+
+    def test_failed_trial_reopens(self):
+        self.breaker.record_probe(False)
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+
+        self.breaker.record_probe(True)
+        self.assertTrue(self.breaker.allow_request())
+        self.breaker.record_failure(Exception("timeout"))
+
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(self.breaker.allow_request())
+
+
+class SharedCircuitBreakerTestCase(TestCase):
+    def setUp(self):
+        self.state_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.state_dir)
+
+    def test_state_is_shared_between_processes(self):
+        worker_1 = CircuitBreaker("router", 2, 30, state_dir=self.state_dir)
+        worker_2 = CircuitBreaker("router", 2, 30, state_dir=self.state_dir)
+
+        worker_1.record_failure(Exception("timeout"))
+        worker_2.record_failure(Exception("timeout"))
+
+        self.assertFalse(worker_1.allow_request())
+        self.assertEqual(worker_2.snapshot()["total_rejections"], 1)
+
+    def test_registry_lists_breakers_from_other_processes(self):
+        CircuitBreaker("router", 2, 30, state_dir=self.state_dir).record_probe(False)
+
+        with override_settings(CIRCUIT_BREAKER_STATE_DIR=self.state_dir):
+            registry = CircuitBreakerRegistry()
+            breakers = registry.all()
+
+        self.assertEqual([breaker.name for breaker in breakers], ["router"])
+        self.assertEqual(breakers[0].state, CircuitBreaker.OPEN)
+
+    def test_single_prober_leader(self):
+        lock_path = os.path.join(self.state_dir, "prober.lock")
+        prober_1 = DeviceProber({}, 1, 1, lock_path=lock_path)
+        prober_2 = DeviceProber({}, 1, 1, lock_path=lock_path)
+
+        self.assertTrue(prober_1.is_leader())
+        self.assertFalse(prober_2.is_leader())
+
+        prober_1.stop()
+        prober_1.run()
+        self.assertTrue(prober_2.is_leader())
+        prober_2.stop()
+        prober_2.run()
+
+
+@override_settings(DRY_RUN=False, CIRCUIT_BREAKER_STATE_DIR=None)
+class DeviceUnavailableTestCase(TestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        device_breakers.clear()
+        device_breakers.get("router").record_probe(False)
+
+    def tearDown(self):
+        device_breakers.clear()
+
+    @patch("apps.device_interaction.connections.ConnectHandler")
+    def test_execute_commands_fails_fast(self, mock_connect_handler):
+        response = CommonUtils.execute_commands({"ip": "router"}, ["dummy_command"])
+
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertIn("Retry-After", response.headers)
+        mock_connect_handler.assert_not_called()
+
+    @patch(
+        "apps.device_interaction.views.ConnectionUtils.get_ncclient_connection_params"
+    )
+    @patch("ncclient.manager.connect")
+    def test_list_interface_fails_fast(
+        self, mock_ncclient_connect, mock_connection_params
+    ):
+        mock_connection_params.return_value = {"host": "router"}
+
+        request = self.factory.get("/interfaces/")
+        response = ListInterfaceView.as_view()(request)
+
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        mock_ncclient_connect.assert_not_called()
+
+    def test_device_health(self):
+        request = self.factory.get("/health/")
+        response = DeviceHealthView.as_view()(request)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        device = response.data["devices"][0]
+        self.assertEqual(device["device"], "router")
+        self.assertEqual(device["state"], CircuitBreaker.OPEN)
+        self.assertFalse(device["reachable"])
+
+
+class ConnectionPoolTestCase(TestCase):
+    def setUp(self):
+        self.connect = MagicMock(side_effect=lambda params: MagicMock())
+        self.close = MagicMock()
+        self.pool = ConnectionPool(
+            connect=self.connect, is_alive=lambda conn: True, close=self.close
+        )
+
+    def test_reuses_idle_connection(self):
+        with self.pool.connection({"host": "router"}) as first:
+            pass
+        with self.pool.connection({"host": "router"}) as second:
+            pass
+
+        self.assertIs(first, second)
+        self.assertEqual(self.connect.call_count, 1)
+
+    def test_discards_connection_on_error(self):
+        with self.assertRaises(RuntimeError):
+            with self.pool.connection({"host": "router"}) as conn:
+                raise RuntimeError("session dropped")
+
+        self.close.assert_called_once_with(conn)
+        with self.pool.connection({"host": "router"}):
+            pass
+        self.assertEqual(self.connect.call_count, 2)
+
+    @patch("apps.device_interaction.connections.time.monotonic")
+    def test_closes_expired_idle_connection(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        with self.pool.connection({"host": "router"}) as conn:
+            pass
+
+        with override_settings(DEVICE_POOL_IDLE_TIMEOUT=60):
+            mock_monotonic.return_value = 150
+            self.pool.close_expired()
+            self.close.assert_not_called()
+
+            mock_monotonic.return_value = 161
+            self.pool.close_expired()
+        self.close.assert_called_once_with(conn)
+
+    @patch("apps.device_interaction.connections.time.monotonic")
+    def test_does_not_reuse_expired_connection(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        with self.pool.connection({"host": "router"}):
+            pass
+
+        mock_monotonic.return_value = 1000
+        with override_settings(DEVICE_POOL_IDLE_TIMEOUT=60):
+            with self.pool.connection({"host": "router"}):
+                pass
+
+        self.assertEqual(self.connect.call_count, 2)
+        self.assertEqual(self.close.call_count, 1)
+
+    @patch("apps.device_interaction.connections.os.getpid")
+    def test_does_not_reuse_connection_after_fork(self, mock_getpid):
+        mock_getpid.return_value = 1
+        self.pool._reset()
+        with self.pool.connection({"host": "router"}):
+            pass
+
+        mock_getpid.return_value = 2
+        with self.pool.connection({"host": "router"}):
+            pass
+
+        self.assertEqual(self.connect.call_count, 2)
+        self.close.assert_not_called()
+
+
+class AddressPlanningTestCase(TestCase):
+    def test_validate_prefixes(self):
+        errors = validate_prefixes(
+            [
+                ("10.0.0.1", "255.255.255.0"),
+                ("10.0.1.1", "255.0.255.0"),
+                ("10.0.2.255", "255.255.255.0"),
+                ("10.0.0.7", "255.255.255.255"),
+                ("invalid", "255.255.255.255"),
+                ("10.0.3.1", "255.255.255.255"),
+            ]
+        )
+
+        self.assertEqual(
+            [(error["index"], error["error"]) for error in errors],
+            [
+                (1, "Subnet mask is not contiguous."),
+                (2, "Address is the network or broadcast address of its subnet."),
+                (3, "Prefix overlaps the prefix at index 0."),
+                (4, errors[3]["error"]),
+            ],
+        )
+        self.assertTrue(errors[3]["error"].startswith("Invalid IPv4 address"))
+
+    def test_allocate_prefixes_skips_allocated(self):
+        allocations = allocate_prefixes(
+            "10.255.0.0/29",
+            3,
+            allocated=[
+                ("10.255.0.0", "255.255.255.255"),
+                ("10.255.0.2", "255.255.255.254"),
+            ],
+        )
+
+        self.assertEqual(
+            allocations,
+            [
+                ("10.255.0.1", "255.255.255.255"),
+                ("10.255.0.4", "255.255.255.255"),
+                ("10.255.0.5", "255.255.255.255"),
+            ],
+        )
+
+    def test_allocate_prefixes_aligns_to_prefix_length(self):
+        allocations = allocate_prefixes(
+            "10.255.0.0/24", 2, 30, allocated=[("10.255.0.1", "255.255.255.255")]
+        )
+
+        self.assertEqual(
+            allocations,
+            [("10.255.0.5", "255.255.255.252"), ("10.255.0.9", "255.255.255.252")],
+        )
+        self.assertEqual(validate_prefixes(allocations), [])
+
+    def test_allocate_prefixes_rejects_non_contiguous_allocated_mask(self):
+        with self.assertRaisesRegex(ValueError, "not contiguous"):
+            allocate_prefixes(
+                "10.255.0.0/24", 2, allocated=[("10.255.0.1", "255.0.255.0")]
+            )
+
+    def test_validate_pools(self):
+        validate_pools({"loopback": "10.255.0.0/16"})
+
+        with self.assertRaisesRegex(ValueError, "Pool loopback"):
+            validate_pools({"loopback": "10.255.0.1/16"})
+
+    def test_allocate_prefixes_pool_exhausted(self):
+        with self.assertRaises(AddressPoolExhausted):
+            allocate_prefixes("10.255.0.0/30", 5)
+
+
+@override_settings(ADDRESS_POOLS={"loopback": "10.255.0.0/30"})
+class AddressPlanViewTestCase(TestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+
+    def test_validate_address_plan(self):
+        payload = {
+            "prefixes": [
+                {"ip_address": "10.255.0.1", "subnet_mask": "255.255.255.255"},
+                {"ip_address": "10.255.0.1", "subnet_mask": "255.255.255.255"},
+            ]
+        }
+
+        request = self.factory.post("/address-plan/validate/", payload, format="json")
+        response = AddressPlanValidateView.as_view()(request)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.data["valid"])
+        self.assertEqual(response.data["errors"][0]["index"], 1)
+
+    def test_address_plan_lists_are_bounded(self):
+        validate_fields = AddressPlanValidateSerializer().fields
+        allocation_fields = AddressAllocationSerializer().fields
+
+        self.assertEqual(
+            validate_fields["prefixes"].max_length, settings.ADDRESS_PLAN_MAX_PREFIXES
+        )
+        self.assertEqual(
+            allocation_fields["allocated"].max_length,
+            settings.ADDRESS_PLAN_MAX_PREFIXES,
+        )
+
+    def test_allocate_addresses(self):
+        payload = {"pool": "loopback", "count": 2}
+
+        request = self.factory.post("/address-plan/allocate/", payload, format="json")
+        response = AddressAllocationView.as_view()(request)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data["addresses"],
+            [
+                {"ip_address": "10.255.0.0", "subnet_mask": "255.255.255.255"},
+                {"ip_address": "10.255.0.1", "subnet_mask": "255.255.255.255"},
+            ],
+        )
+
+    def test_allocate_addresses_unknown_pool(self):
+        payload = {"pool": "unknown", "count": 1}
+
+        request = self.factory.post("/address-plan/allocate/", payload, format="json")
+        response = AddressAllocationView.as_view()(request)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("pool", response.data)
+
+    def test_allocate_addresses_pool_exhausted(self):
+        payload = {"pool": "loopback", "count": 5}
+
+        request = self.factory.post("/address-plan/allocate/", payload, format="json")
+        response = AddressAllocationView.as_view()(request)
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
@@ -5,16 +5,30 @@ from .views import (
     DeleteLoopbackView,
     ListInterfaceView,
     DryRunConfigView,
+    DeviceHealthView,
+    AddressPlanValidateView,
+    AddressAllocationView,
 )
 
 urlpatterns = [
     path("configure-dry-run/", DryRunConfigView.as_view(), name="configure-dry-run"),
+    path("health/", DeviceHealthView.as_view(), name="device-health"),
     path("interfaces/", ListInterfaceView.as_view(), name="list-interfaces"),
     path(
         "configure-loopback/",
         ConfigureLoopbackView.as_view(),
         name="configure-loopback",
     ),
+    path(
+        "address-plan/validate/",
+        AddressPlanValidateView.as_view(),
+        name="validate-address-plan",
+    ),
+    path(
+        "address-plan/allocate/",
+        AddressAllocationView.as_view(),
+        name="allocate-addresses",
+    ),
     path(
         "delete-loopback/<str:loopback_number>/",
         DeleteLoopbackView.as_view(),
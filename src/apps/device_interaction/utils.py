@@ -1,8 +1,10 @@
 from django.conf import settings
-from netmiko import ConnectHandler
 from rest_framework import status
 from rest_framework.response import Response
 
+from .circuit_breaker import device_breakers
+from .connections import netmiko_pool
+
 
 class CommonUtils:
     @staticmethod
@@ -61,19 +63,47 @@ class CommonUtils:
             }
             return Response(response_data, status=status.HTTP_202_ACCEPTED)
         else:
+            breaker = device_breakers.get(device.get("ip"))
+            rejection = breaker.check()
+            if rejection is not None:
+                return CommonUtils.device_unavailable_response(rejection)
             try:
-                with ConnectHandler(**device) as net_connect:
+                with netmiko_pool.connection(device) as net_connect:
                     net_connect.enable()
                     output = net_connect.send_config_set(commands)
+                    breaker.record_success()
                     response_data = {"message": "Configuration applied successfully"}
                     return Response(response_data, status=status.HTTP_202_ACCEPTED)
             except Exception as e:
+                breaker.record_failure(e)
                 error_message = f"Configuration failed: {str(e)}"
                 return Response(
                     {"error": error_message},
                     status=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 )
 
+    @staticmethod
+    def device_unavailable_response(snapshot):
+        """
+        Build the fail-fast response returned while a device's breaker is open.
+
+        Args:
+            snapshot (dict): The breaker snapshot taken when the request was rejected.
+
+        Returns:
+            Response: A 503 response with a Retry-After header.
+        """
+        error_message = (
+            f"Device {snapshot['device']} is unavailable "
+            f"(circuit {snapshot['state']}); "
+            f"retry after {snapshot['retry_after']} seconds."
+        )
+        return Response(
+            {"error": error_message, "device": snapshot},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            headers={"Retry-After": str(snapshot["retry_after"])},
+        )
+
 
 class ConnectionUtils:
     @staticmethod
@@ -102,7 +132,7 @@ class ConnectionUtils:
         """
         return {
             "host": settings.NETCONF_HOST,
-            "port": 830,
+            "port": int(settings.NETCONF_PORT),
             "username": settings.NETCONF_USERNAME,
             "password": settings.NETCONF_PASSWORD,
             "device_params": {"name": "iosxr"},
@@ -1,12 +1,23 @@
 import xmltodict
 from django.conf import settings
 from drf_yasg.utils import swagger_auto_schema
-from ncclient import manager
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from .serializers import LoopbackConfigSerializer, DryRunConfigSerializer
+from .address_planning import (
+    AddressPoolExhausted,
+    allocate_prefixes,
+    validate_prefixes,
+)
+from .circuit_breaker import device_breakers
+from .connections import ncclient_pool
+from .serializers import (
+    LoopbackConfigSerializer,
+    DryRunConfigSerializer,
+    AddressPlanValidateSerializer,
+    AddressAllocationSerializer,
+)
 from .utils import CommonUtils, ConnectionUtils
 
 
@@ -116,11 +127,26 @@ class ListInterfaceView(APIView):
             }
             return Response(response_data, status=status.HTTP_200_OK)
         else:
+            breaker = device_breakers.get(device.get("host"))
+            rejection = breaker.check()
+            if rejection is not None:
+                return CommonUtils.device_unavailable_response(rejection)
             try:
-                with manager.connect(**device) as m:
+                with ncclient_pool.connection(device) as m:
                     result = m.get(netconf_filter)
-                    data = xmltodict.parse(result.data_xml)
-                    return Response(data, status=status.HTTP_200_OK)
+            except Exception as e:
+                breaker.record_failure(e)
+                error_message = f"Failed to retrieve interface configurations: {str(e)}"
+                return Response(
+                    {"error": error_message},
+                    status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                )
+
+            # Only transport errors count against the breaker, not a bad payload.
+            breaker.record_success()
+            try:
+                data = xmltodict.parse(result.data_xml)
+                return Response(data, status=status.HTTP_200_OK)
             except Exception as e:
                 error_message = f"Failed to retrieve interface configurations: {str(e)}"
                 return Response(
@@ -154,3 +180,104 @@ class DryRunConfigView(APIView):
             return Response({"status": status_msg}, status=status.HTTP_200_OK)
         else:
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class DeviceHealthView(APIView):
+    """
+    API view exposing the circuit breaker state of each network device.
+    """
+
+    @swagger_auto_schema(tags=["default"])
+    def get(self, request, format=None):
+        """
+        Retrieve the circuit breaker state and cached health of every device.
+
+        Args:
+            request (Request): The HTTP request object.
+            format (str): The format of the response (default is None).
+
+        Returns:
+            Response: The response containing one entry per known device.
+        """
+        if settings.NETCONF_HOST:
+            device_breakers.get(settings.NETCONF_HOST)
+        devices = [breaker.snapshot() for breaker in device_breakers.all()]
+        return Response({"devices": devices}, status=status.HTTP_200_OK)
+
+
+class AddressPlanValidateView(APIView):
+    """
+    API view for validating a loopback address plan in bulk.
+    """
+
+    @swagger_auto_schema(
+        tags=["address-plan"], request_body=AddressPlanValidateSerializer
+    )
+    def post(self, request, format=None):
+        """
+        Validate subnet masks, reserved addresses and overlaps of an address plan.
+
+        Args:
+            request (Request): The HTTP request object.
+            format (str): The format of the response (default is None).
+
+        Returns:
+            Response: The response containing the validation errors of the plan.
+        """
+        serializer = AddressPlanValidateSerializer(data=request.data)
+        if serializer.is_valid():
+            prefixes = serializer.validated_data["prefixes"]
+            errors = validate_prefixes(prefixes)
+            response_data = {
+                "valid": not errors,
+                "count": len(prefixes),
+                "errors": errors,
+            }
+            return Response(response_data, status=status.HTTP_200_OK)
+        else:
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class AddressAllocationView(APIView):
+    """
+    API view for allocating loopback addresses from a configured pool.
+    """
+
+    @swagger_auto_schema(
+        tags=["address-plan"], request_body=AddressAllocationSerializer
+    )
+    def post(self, request, format=None):
+        """
+        Allocate the next free prefixes from an address pool.
+
+        Args:
+            request (Request): The HTTP request object.
+            format (str): The format of the response (default is None).
+
+        Returns:
+            Response: The response containing the allocated addresses or error messages.
+        """
+        serializer = AddressAllocationSerializer(data=request.data)
+        if serializer.is_valid():
+            pool = serializer.validated_data["pool"]
+            try:
+                allocations = allocate_prefixes(
+                    settings.ADDRESS_POOLS[pool],
+                    serializer.validated_data["count"],
+                    serializer.validated_data["prefix_length"],
+                    serializer.validated_data["allocated"],
+                )
+            except AddressPoolExhausted as e:
+                return Response({"error": str(e)}, status=status.HTTP_409_CONFLICT)
+            except ValueError as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            response_data = {
+                "pool": pool,
+                "addresses": [
+                    {"ip_address": ip_address, "subnet_mask": subnet_mask}
+                    for ip_address, subnet_mask in allocations
+                ],
+            }
+            return Response(response_data, status=status.HTTP_200_OK)
+        else:
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
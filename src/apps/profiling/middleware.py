@@ -0,0 +1,84 @@
+import cProfile
+import hmac
+import logging
+import random
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from .storage import ProfileStore
+
+logger = logging.getLogger(__name__)
+
+
+class RequestProfilingMiddleware:
+    """
+    Opt-in middleware that records a cProfile profile of selected requests.
+
+    A request is profiled when its ``PROFILING_HEADER`` header matches the
+    secret ``PROFILING_HEADER_TOKEN`` (the header is ignored while no token is
+    configured), when it is picked by ``PROFILING_SAMPLE_RATE``, or, if
+    ``PROFILING_LATENCY_THRESHOLD`` is set, always, keeping the profile only if
+    the request turned out slower than the threshold. The profile covers the
+    whole view, including device connection, command execution and parsing.
+    """
+
+    def __init__(self, get_response):
+        if not settings.PROFILING_ENABLED:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        self.store = ProfileStore()
+
+    def __call__(self, request):
+        trigger = self._trigger(request)
+        if trigger is None:
+            return self.get_response(request)
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler is already active in this process.
+            return self.get_response(request)
+
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            profiler.disable()
+        duration = time.perf_counter() - started
+
+        threshold = float(settings.PROFILING_LATENCY_THRESHOLD)
+        if trigger == "latency" and duration < threshold:
+            return response
+
+        # Storing the profile must never break the request it observed.
+        try:
+            profile_id = self.store.save(
+                profiler,
+                {
+                    "method": request.method,
+                    "path": request.path,
+                    "status_code": response.status_code,
+                    "duration": duration,
+                    "trigger": trigger,
+                },
+            )
+        except (OSError, ValueError):
+            logger.exception("Failed to store profile of %s", request.path)
+            return response
+        response["X-Profile-Id"] = profile_id
+        return response
+
+    @staticmethod
+    def _trigger(request):
+        token = settings.PROFILING_HEADER_TOKEN
+        header = request.headers.get(settings.PROFILING_HEADER)
+        if token and header and hmac.compare_digest(header, token):
+            return "header"
+        if random.random() < float(settings.PROFILING_SAMPLE_RATE):
+            return "sample"
+        if float(settings.PROFILING_LATENCY_THRESHOLD) > 0:
+            return "latency"
+        return None
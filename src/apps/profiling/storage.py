@@ -0,0 +1,99 @@
+import json
+import os
+import re
+import time
+from pathlib import Path
+
+from django.conf import settings
+
+PROFILE_ID_PATTERN = re.compile(r"^[0-9]+-[0-9]+$")
+
+
+class ProfileStore:
+    """
+    Bounded on-disk ring buffer of request profiles.
+
+    Each profile is stored as a ``<id>.prof`` file in :mod:`pstats` format
+    (readable with ``python -m pstats``, snakeviz or flameprof) next to a
+    ``<id>.json`` file holding the request metadata. Once more than
+    ``max_profiles`` profiles are stored, the oldest ones are removed.
+    """
+
+    def __init__(self, directory=None, max_profiles=None):
+        self.directory = Path(directory or settings.PROFILING_DIR)
+        self.max_profiles = int(max_profiles or settings.PROFILING_MAX_PROFILES)
+
+    def save(self, profiler, metadata):
+        """
+        Store a profile and evict the oldest ones beyond the buffer size.
+
+        Args:
+            profiler (cProfile.Profile): The finished profiler.
+            metadata (dict): Request details to store alongside the profile.
+
+        Returns:
+            str: The id of the stored profile.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        profile_id = f"{time.time_ns()}-{os.getpid()}"
+        profiler.dump_stats(self.profile_path(profile_id))
+        metadata = dict(metadata, id=profile_id, created_at=time.time())
+        with open(self._metadata_path(profile_id), "w") as metadata_file:
+            json.dump(metadata, metadata_file)
+        self._evict()
+        return profile_id
+
+    def list(self):
+        """
+        List stored profiles, newest first.
+
+        Returns:
+            list: A list of metadata dictionaries.
+        """
+        profiles = []
+        for profile_id in reversed(self._ids()):
+            try:
+                with open(self._metadata_path(profile_id)) as metadata_file:
+                    profiles.append(json.load(metadata_file))
+            except (OSError, ValueError):
+                continue
+        return profiles
+
+    def profile_path(self, profile_id):
+        """
+        Get the path of a stored profile.
+
+        Args:
+            profile_id (str): The id of the profile.
+
+        Returns:
+            Path or None: The path of the profile, or None if the id is invalid.
+        """
+        if not PROFILE_ID_PATTERN.match(profile_id):
+            return None
+        return self.directory / f"{profile_id}.prof"
+
+    def _metadata_path(self, profile_id):
+        return self.directory / f"{profile_id}.json"
+
+    def _ids(self):
+        if not self.directory.is_dir():
+            return []
+        ids = [
+            path.stem
+            for path in self.directory.glob("*.prof")
+            if PROFILE_ID_PATTERN.match(path.stem)
+        ]
+        return sorted(ids, key=lambda profile_id: int(profile_id.split("-")[0]))
+
+    def _evict(self):
+        ids = self._ids()
+        for profile_id in ids[: max(len(ids) - self.max_profiles, 0)]:
+            for path in (
+                self.profile_path(profile_id),
+                self._metadata_path(profile_id),
+            ):
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
@@ -0,0 +1,141 @@
+import cProfile
+import shutil
+import tempfile
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from .middleware import RequestProfilingMiddleware
+from .storage import ProfileStore
+
+
+class ProfilingTestMixin:
+    def setUp(self):
+        self.profile_dir = tempfile.mkdtemp()
+        self.settings_override = override_settings(
+            PROFILING_ENABLED=True,
+            PROFILING_DIR=self.profile_dir,
+            PROFILING_MAX_PROFILES=2,
+            PROFILING_SAMPLE_RATE=0,
+            PROFILING_LATENCY_THRESHOLD=0,
+            PROFILING_HEADER_TOKEN="secret",
+        )
+        self.settings_override.enable()
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.profile_dir)
+
+
+class ProfileStoreTestCase(ProfilingTestMixin, TestCase):
+    def test_evicts_oldest_profiles(self):
+        store = ProfileStore()
+        ids = [store.save(cProfile.Profile(), {"path": f"/{i}/"}) for i in range(3)]
+
+        profiles = store.list()
+
+        self.assertEqual([profile["id"] for profile in profiles], ids[:0:-1])
+        self.assertFalse(store.profile_path(ids[0]).exists())
+
+    def test_ignores_unrelated_files(self):
+        store = ProfileStore()
+        open(f"{self.profile_dir}/slow.prof", "w").close()
+        ids = [store.save(cProfile.Profile(), {"path": f"/{i}/"}) for i in range(3)]
+
+        self.assertEqual([profile["id"] for profile in store.list()], ids[:0:-1])
+
+    def test_rejects_invalid_profile_id(self):
+        self.assertIsNone(ProfileStore().profile_path("../settings"))
+
+
+class RequestProfilingMiddlewareTestCase(ProfilingTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.factory = RequestFactory()
+        self.middleware = RequestProfilingMiddleware(lambda request: HttpResponse())
+
+    def test_profiles_request_with_header(self):
+        request = self.factory.get("/device/interfaces/", HTTP_X_PROFILE="secret")
+        response = self.middleware(request)
+
+        profiles = ProfileStore().list()
+        self.assertEqual(len(profiles), 1)
+        self.assertEqual(response["X-Profile-Id"], profiles[0]["id"])
+        self.assertEqual(profiles[0]["trigger"], "header")
+        self.assertEqual(profiles[0]["path"], "/device/interfaces/")
+
+    @patch("apps.profiling.middleware.ProfileStore.save")
+    def test_storage_error_does_not_break_request(self, mock_save):
+        mock_save.side_effect = OSError("No space left on device")
+        request = self.factory.get("/device/interfaces/", HTTP_X_PROFILE="secret")
+
+        with self.assertLogs("apps.profiling.middleware", level="ERROR"):
+            response = self.middleware(request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("X-Profile-Id", response)
+
+    def test_ignores_header_with_wrong_token(self):
+        for value in ("1", "0", "false"):
+            request = self.factory.get("/device/interfaces/", HTTP_X_PROFILE=value)
+            response = self.middleware(request)
+
+            self.assertNotIn("X-Profile-Id", response)
+        self.assertEqual(ProfileStore().list(), [])
+
+    def test_ignores_header_without_configured_token(self):
+        request = self.factory.get("/device/interfaces/", HTTP_X_PROFILE="secret")
+
+        with override_settings(PROFILING_HEADER_TOKEN=None):
+            response = self.middleware(request)
+
+        self.assertNotIn("X-Profile-Id", response)
+
+    def test_skips_request_without_trigger(self):
+        response = self.middleware(self.factory.get("/device/interfaces/"))
+
+        self.assertNotIn("X-Profile-Id", response)
+        self.assertEqual(ProfileStore().list(), [])
+
+    def test_keeps_only_slow_requests_above_threshold(self):
+        with override_settings(PROFILING_LATENCY_THRESHOLD=60):
+            response = self.middleware(self.factory.get("/device/interfaces/"))
+
+        self.assertNotIn("X-Profile-Id", response)
+        self.assertEqual(ProfileStore().list(), [])
+
+
+class ProfileViewsTestCase(ProfilingTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.profile_id = ProfileStore().save(cProfile.Profile(), {"path": "/"})
+
+    def test_requires_admin(self):
+        response = self.client.get("/profiles/")
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_list_and_download_profiles(self):
+        admin = User.objects.create_superuser("admin", "admin@example.com", "admin")
+        self.client.force_authenticate(admin)
+
+        response = self.client.get("/profiles/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["profiles"][0]["id"], self.profile_id)
+
+        response = self.client.get(f"/profiles/{self.profile_id}/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(b"".join(response.streaming_content))
+
+    def test_download_missing_profile(self):
+        admin = User.objects.create_superuser("admin", "admin@example.com", "admin")
+        self.client.force_authenticate(admin)
+
+        response = self.client.get("/profiles/1-1/")
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,12 @@
+from django.urls import path
+
+from .views import ProfileListView, ProfileDownloadView
+
+urlpatterns = [
+    path("", ProfileListView.as_view(), name="list-profiles"),
+    path(
+        "<str:profile_id>/",
+        ProfileDownloadView.as_view(),
+        name="download-profile",
+    ),
+]
@@ -0,0 +1,66 @@
+from django.http import FileResponse
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework import status
+from rest_framework.authentication import BasicAuthentication, SessionAuthentication
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .storage import ProfileStore
+
+
+class ProfileListView(APIView):
+    """
+    Admin-only API view for listing stored request profiles.
+    """
+
+    authentication_classes = [SessionAuthentication, BasicAuthentication]
+    permission_classes = [IsAdminUser]
+
+    @swagger_auto_schema(tags=["profiling"])
+    def get(self, request, format=None):
+        """
+        List the stored request profiles, newest first.
+
+        Args:
+            request (Request): The HTTP request object.
+            format (str): The format of the response (default is None).
+
+        Returns:
+            Response: The response containing the metadata of each profile.
+        """
+        return Response({"profiles": ProfileStore().list()}, status=status.HTTP_200_OK)
+
+
+class ProfileDownloadView(APIView):
+    """
+    Admin-only API view for downloading a stored request profile.
+    """
+
+    authentication_classes = [SessionAuthentication, BasicAuthentication]
+    permission_classes = [IsAdminUser]
+
+    @swagger_auto_schema(tags=["profiling"])
+    def get(self, request, profile_id, format=None):
+        """
+        Download a request profile in pstats format.
+
+        Args:
+            request (Request): The HTTP request object.
+            profile_id (str): The id of the profile to download.
+            format (str): The format of the response (default is None).
+
+        Returns:
+            FileResponse or Response: The profile file or an error response.
+        """
+        path = ProfileStore().profile_path(profile_id)
+        if path is None or not path.is_file():
+            return Response(
+                {"error": "Profile not found."}, status=status.HTTP_404_NOT_FOUND
+            )
+        return FileResponse(
+            open(path, "rb"),
+            as_attachment=True,
+            filename=path.name,
+            content_type="application/octet-stream",
+        )
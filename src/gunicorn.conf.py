@@ -0,0 +1,70 @@
+"""
+Gunicorn configuration for running network_device_management in production.
+
+Every value is read from the Django settings module (``settings.production``
+by default; settings with ``DEBUG`` enabled are refused), so the server is
+tuned through the same environment variables as the application itself:
+
+    gunicorn -c gunicorn.conf.py network_device_management.wsgi:application
+
+The application is preloaded in the master process so Django, the device
+libraries and the URL/schema setup are imported once and shared with the
+workers copy-on-write. Per-process state that must not cross a fork (device
+sessions, the reachability prober, database connections) is re-initialized in
+``post_fork``. Circuit breaker state is kept in ``CIRCUIT_BREAKER_STATE_DIR``
+so all workers share it, and only one worker at a time probes devices.
+
+Workers are recycled after ``max_requests`` with a graceful timeout long
+enough to drain in-flight device sessions, and close their pooled sessions
+on exit.
+"""
+import os
+import tempfile
+
+from dotenv import load_dotenv
+
+load_dotenv()  # take environment variables from .env.
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "settings.production")
+# Share circuit breaker state and a single device prober between workers.
+if not os.environ.get("CIRCUIT_BREAKER_STATE_DIR"):
+    os.environ["CIRCUIT_BREAKER_STATE_DIR"] = os.path.join(
+        tempfile.gettempdir(), "network-device-management"
+    )
+
+from django.conf import settings  # noqa: E402
+
+if settings.DEBUG:
+    raise RuntimeError(
+        "Refusing to run gunicorn with DEBUG enabled "
+        f"(DJANGO_SETTINGS_MODULE={os.environ['DJANGO_SETTINGS_MODULE']}); "
+        "use settings.production or run the development server instead."
+    )
+
+bind = settings.GUNICORN_BIND
+workers = settings.GUNICORN_WORKERS
+worker_class = settings.GUNICORN_WORKER_CLASS
+timeout = settings.GUNICORN_TIMEOUT
+graceful_timeout = settings.GUNICORN_GRACEFUL_TIMEOUT
+max_requests = settings.GUNICORN_MAX_REQUESTS
+max_requests_jitter = settings.GUNICORN_MAX_REQUESTS_JITTER
+preload_app = True
+accesslog = "-"
+errorlog = "-"
+
+
+def post_fork(server, worker):
+    from django.db import connections
+
+    from apps.device_interaction.circuit_breaker import start_prober
+
+    connections.close_all()
+    start_prober()
+
+
+def worker_exit(server, worker):
+    from apps.device_interaction.circuit_breaker import stop_prober
+    from apps.device_interaction.connections import close_all_pools
+
+    stop_prober()
+    close_all_pools()
@@ -46,6 +46,7 @@ urlpatterns = [
         name="health-check",
     ),
     path("device/", include("apps.device_interaction.urls")),
+    path("profiles/", include("apps.profiling.urls")),
     path(
         "swagger<format>/", schema_view.without_ui(cache_timeout=0), name="schema-json"
     ),
@@ -9,6 +9,8 @@ https://docs.djangoproject.com/en/4.2/topics/settings/
 For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
+import json
+import multiprocessing
 import os
 from pathlib import Path
 
@@ -38,10 +40,13 @@ INSTALLED_APPS = [
     "rest_framework",
     "drf_yasg",
     "apps.device_interaction",
+    "apps.profiling",
 ]
 
 MIDDLEWARE = [
+    "apps.profiling.middleware.RequestProfilingMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "whitenoise.middleware.WhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -117,6 +122,7 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/4.2/howto/static-files/
 
 STATIC_URL = "static/"
+STATIC_ROOT = BASE_DIR / "staticfiles"
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
@@ -126,13 +132,63 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 # Netconf
 NETCONF_HOST = os.environ.get("NETCONF_HOST", None)
 NETCONF_SSH_PORT = os.environ.get("NETCONF_SSH_PORT", 22)
-NETCONF_PORT = os.environ.get("NETCONF_PORT", None)
+NETCONF_PORT = os.environ.get("NETCONF_PORT", 830)
 NETCONF_XR_BASH_PORT = os.environ.get("NETCONF_XR_BASH_PORT", None)
 NETCONF_GRPC_PORT = os.environ.get("NETCONF_GRPC_PORT", None)
 NETCONF_USERNAME = os.environ.get("NETCONF_USERNAME", None)
 NETCONF_PASSWORD = os.environ.get("NETCONF_PASSWORD", None)
 NETCONF_TIMEOUT = os.environ.get("NETCONF_TIMEOUT", 30)
 
+# Circuit breaker
+CIRCUIT_BREAKER_FAILURE_THRESHOLD = int(
+    os.environ.get("CIRCUIT_BREAKER_FAILURE_THRESHOLD", 3)
+)
+CIRCUIT_BREAKER_RESET_TIMEOUT = float(
+    os.environ.get("CIRCUIT_BREAKER_RESET_TIMEOUT", 30)
+)
+# Directory holding breaker state shared by all worker processes; when unset,
+# each process keeps its own state. gunicorn.conf.py sets a default.
+CIRCUIT_BREAKER_STATE_DIR = os.environ.get("CIRCUIT_BREAKER_STATE_DIR") or None
+
+# Device reachability prober
+DEVICE_PROBE_ENABLED = os.environ.get("DEVICE_PROBE_ENABLED", "True") == "True"
+DEVICE_PROBE_INTERVAL = float(os.environ.get("DEVICE_PROBE_INTERVAL", 10))
+DEVICE_PROBE_TIMEOUT = float(os.environ.get("DEVICE_PROBE_TIMEOUT", 3))
+
+# Device connection pool (per worker process)
+DEVICE_POOL_MAX_IDLE = int(os.environ.get("DEVICE_POOL_MAX_IDLE", 1))
+DEVICE_POOL_IDLE_TIMEOUT = float(os.environ.get("DEVICE_POOL_IDLE_TIMEOUT", 60))
+
+# Production server (gunicorn), see gunicorn.conf.py
+GUNICORN_BIND = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+GUNICORN_WORKERS = int(
+    os.environ.get("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1)
+)
+GUNICORN_WORKER_CLASS = os.environ.get("GUNICORN_WORKER_CLASS", "sync")
+GUNICORN_TIMEOUT = int(os.environ.get("GUNICORN_TIMEOUT", int(NETCONF_TIMEOUT) * 2))
+GUNICORN_GRACEFUL_TIMEOUT = int(
+    os.environ.get("GUNICORN_GRACEFUL_TIMEOUT", int(NETCONF_TIMEOUT) * 2)
+)
+GUNICORN_MAX_REQUESTS = int(os.environ.get("GUNICORN_MAX_REQUESTS", 1000))
+GUNICORN_MAX_REQUESTS_JITTER = int(os.environ.get("GUNICORN_MAX_REQUESTS_JITTER", 100))
+
+# Request profiling (see apps.profiling)
+PROFILING_ENABLED = os.environ.get("PROFILING_ENABLED", "False") == "True"
+PROFILING_HEADER = os.environ.get("PROFILING_HEADER", "X-Profile")
+# Secret the profiling header must carry; the header is ignored when unset.
+PROFILING_HEADER_TOKEN = os.environ.get("PROFILING_HEADER_TOKEN") or None
+PROFILING_SAMPLE_RATE = float(os.environ.get("PROFILING_SAMPLE_RATE", 0))
+PROFILING_LATENCY_THRESHOLD = float(os.environ.get("PROFILING_LATENCY_THRESHOLD", 0))
+PROFILING_DIR = os.environ.get("PROFILING_DIR", BASE_DIR / "profiles")
+PROFILING_MAX_PROFILES = int(os.environ.get("PROFILING_MAX_PROFILES", 100))
+
+# Address planning: named pools (CIDR) that loopback addresses are allocated from
+ADDRESS_POOLS = json.loads(
+    os.environ.get("ADDRESS_POOLS", '{"loopback": "10.255.0.0/16"}')
+)
+ADDRESS_ALLOCATION_MAX = int(os.environ.get("ADDRESS_ALLOCATION_MAX", 65536))
+ADDRESS_PLAN_MAX_PREFIXES = int(os.environ.get("ADDRESS_PLAN_MAX_PREFIXES", 100000))
+
 # Dry Run
 DRY_RUN = os.environ.get("DRY_RUN", False)
 